@@ -62,6 +62,16 @@ class MyBot(commands.Bot):
         await self.tree.sync()
         print("スラッシュコマンドを同期しました。")
 
+    async def close(self):
+        """Bot終了時に、未保存のギルド設定をファイルへ書き出し、AIとの接続を閉じてから終了する"""
+        try:
+            await self.settings_repo.flush()
+        except FileOperationError:
+            logging.exception("ギルド設定の保存に失敗しました。")
+        if self.game_service:
+            await self.game_service.ai.close()
+        await super().close()
+
     async def on_ready(self):
         print(f'{self.user} としてDiscordにログインしました')
         await self._update_command_lists()
@@ -62,9 +62,8 @@ class CharacterCommandsCog(commands.Cog, name="キャラクター管理"):
             if character.stat_points <= 0 and character.skill_points <= 0:
                 return await interaction.response.send_message("使用できる強化ポイントがありません。", ephemeral=True)
 
-            embed = create_character_embed(character)
             view = LevelUpView(interaction.user, character, self.bot)
-            await interaction.response.send_message("キャラクターを強化します。どの項目を強化しますか？", embed=embed, view=view, ephemeral=True)
+            await interaction.response.send_message("キャラクターを強化します。どの項目を強化しますか？", embed=view.get_embed(), view=view, ephemeral=True)
             view.message = await interaction.original_response()
 
     # --- 経験値追加（テスト用） ---
@@ -93,7 +92,7 @@ class CharacterCommandsCog(commands.Cog, name="キャラクター管理"):
             await interaction.response.send_message(messaging.MSG_SESSION_REQUIRED, ephemeral=True)
             return
 
-        all_quests_data = self.bot.world_data_loader.get('quests')
+        all_quests_data = self.bot.world_data_loader.get('fantasy_world', 'quests') or {}
         embed = create_journal_embed(session.character, all_quests_data)
         await interaction.response.send_message(embed=embed, ephemeral=True)
 
@@ -3,6 +3,7 @@ from discord import app_commands
 from discord.ext import commands
 from typing import List, TYPE_CHECKING, Dict, Union
 import logging
+from itertools import islice
 
 from core.errors import GameError, CharacterNotFoundError
 from bot.ui.views import ConfirmDeleteView, ActionSuggestionView
@@ -227,8 +228,10 @@ class GameCommandsCog(commands.Cog, name="ゲーム管理"):
         session = self.bot.game_service.get_session(interaction.user.id)
         if not session:
             return []
-        inventory = session.character.inventory
-        return [app_commands.Choice(name=item, value=item) for item in inventory if current.lower() in item.lower()][:25]
+        # 入力のたびに呼ばれるため、小文字化は一度だけ行い、25件に達した時点で打ち切る
+        needle = current.lower()
+        matches = (item for item in session.character.inventory if needle in item.lower())
+        return [app_commands.Choice(name=item, value=item) for item in islice(matches, 25)]
 
 async def _character_autocomplete(interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
     """キャラクター名をオートコンプリートするための共通メソッド"""
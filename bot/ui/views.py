@@ -3,9 +3,10 @@ import logging
 from discord import ui
 import random
 from typing import TYPE_CHECKING, List, Optional
-from functools import partial
+from functools import partial, lru_cache
 
 from game.models.character import Character
+from game.services.character_service import CharacterService
 from bot.ui.embeds import create_character_embed
 from bot import messaging
 
@@ -16,7 +17,12 @@ if TYPE_CHECKING:
 def roll_for_stat():
     """能力値1つ分のダイスを振る (4d6の上位3つの和)"""
     rolls = [random.randint(1, 6) for _ in range(4)]
-    return sum(sorted(rolls, reverse=True)[:3])
+    return sum(rolls) - min(rolls)
+
+@lru_cache(maxsize=128)
+def _char_select_options(names: tuple[str, ...]) -> tuple[discord.SelectOption, ...]:
+    """キャラクター名の組ごとにSelectOptionを一度だけ生成して使い回す"""
+    return tuple(discord.SelectOption(label=name) for name in names)
 
 logger = logging.getLogger(__name__)
 
@@ -34,6 +40,12 @@ class BaseOwnedView(ui.View):
             return False
         return True
 
+    def _set_items(self, items: List[ui.Item]):
+        """Viewの子要素をまとめて差し替える"""
+        self.clear_items()
+        for item in items:
+            self.add_item(item)
+
 class ConfirmDeleteView(BaseOwnedView):
     """キャラクター削除の最終確認を行うView"""
     def __init__(self, author_id: int, bot: "MyBot", char_name: str):
@@ -67,18 +79,26 @@ class ActionSuggestionView(ui.View):
         self.message: discord.Message = None
         
         # 提案されたアクションごとにボタンを作成
+        buttons = []
         for action in actions:
             button = ui.Button(label=action, style=discord.ButtonStyle.secondary)
             # partialを使って、コールバックにactionテキストを直接渡す
             button.callback = partial(self.on_action_button_click, action=action)
             self.add_item(button)
+            buttons.append(button)
+        # 無効化の対象は構築時に確定しているので、参照を保持しておく
+        self._buttons = tuple(buttons)
+
+    def _disable_all_buttons(self):
+        """全ての選択肢ボタンを無効化する"""
+        for button in self._buttons:
+            button.disabled = True
             
     async def on_action_button_click(self, interaction: discord.Interaction, action: str):
         """アクションボタンがクリックされたときの共通処理"""
         
         # 2回以上押せないように、また他の選択肢も押せないように即座に無効化
-        for item in self.children:
-            item.disabled = True
+        self._disable_all_buttons()
         # viewを更新してボタンを無効化
         await interaction.response.edit_message(view=self)
 
@@ -94,8 +114,7 @@ class ActionSuggestionView(ui.View):
 
     async def on_timeout(self):
         """Viewがタイムアウトしたときの処理"""
-        for item in self.children:
-            item.disabled = True
+        self._disable_all_buttons()
         
         if self.message:
             try:
@@ -117,6 +136,8 @@ class ActionSuggestionView(ui.View):
 class CharacterCreationView(BaseOwnedView):
     """キャラクター作成の対話フローを管理するView"""
     MAX_REROLLS = 3 # リロール回数の上限
+    # 世界データは起動中に変わらないため、種族・クラスの選択肢は全Viewで共有する
+    _select_options_cache: dict[str, tuple[discord.SelectOption, ...]] = {}
 
     def __init__(self, author: discord.User, bot: "MyBot"):
         super().__init__(user_id=author.id, timeout=300)
@@ -128,16 +149,23 @@ class CharacterCreationView(BaseOwnedView):
         self.temp_character: Optional[Character] = None
         self.reroll_count = 0
 
+    def _get_select_options(self, key: str) -> List[discord.SelectOption]:
+        """creation_options[key] から作成したSelectOptionを、初回のみ生成して返す"""
+        cached = self._select_options_cache.get(key)
+        if cached is None:
+            cached = tuple(discord.SelectOption(label=opt["name"], description=opt["description"]) for opt in self.options.get(key, []))
+            self._select_options_cache[key] = cached
+        return list(cached)
+
     @ui.button(label="キャラクター作成を開始", style=discord.ButtonStyle.success, custom_id="start_creation")
     async def start_creation(self, interaction: discord.Interaction, button: ui.Button):
         modal = NameInputModal(title="キャラクター作成：名前", view=self)
         await interaction.response.send_modal(modal)
 
     async def prompt_race_selection(self):
-        race_options = [discord.SelectOption(label=race["name"], description=race["description"]) for race in self.options.get("races", [])]
-        select = ui.Select(placeholder="種族を選択してください...", options=race_options)
+        select = ui.Select(placeholder="種族を選択してください...", options=self._get_select_options("races"))
         select.callback = self.on_race_selected
-        self.clear_items(); self.add_item(select)
+        self._set_items([select])
         await self.message.edit(content="あなたのキャラクターの「種族」を教えてください。", view=self)
 
     async def on_race_selected(self, interaction: discord.Interaction):
@@ -145,10 +173,9 @@ class CharacterCreationView(BaseOwnedView):
         await interaction.response.defer(); await self.prompt_class_selection()
 
     async def prompt_class_selection(self):
-        class_options = [discord.SelectOption(label=cls["name"], description=cls["description"]) for cls in self.options.get("classes", [])]
-        select = ui.Select(placeholder="クラスを選択してください...", options=class_options)
+        select = ui.Select(placeholder="クラスを選択してください...", options=self._get_select_options("classes"))
         select.callback = self.on_class_selected
-        self.clear_items(); self.add_item(select)
+        self._set_items([select])
         await self.message.edit(content="次に「クラス（職業）」を教えてください。", view=self)
 
     async def on_class_selected(self, interaction: discord.Interaction):
@@ -161,15 +188,14 @@ class CharacterCreationView(BaseOwnedView):
         async def callback(interaction: discord.Interaction):
             await interaction.response.send_modal(ProfileInputModal(title="キャラクター作成：プロフィール", view=self))
         profile_button.callback = callback
-        self.clear_items(); self.add_item(profile_button)
+        self._set_items([profile_button])
         await self.message.edit(content="キャラクターの「外見」や「背景設定」を入力します。", view=self, embed=None)
 
     async def prompt_stats_decision(self):
         """能力値決定のステップに進むためのボタンを表示する"""
         roll_button = ui.Button(label="能力値を決める (ダイスロール)", style=discord.ButtonStyle.success)
         roll_button.callback = self.prompt_stats_roll
-        self.clear_items()
-        self.add_item(roll_button)
+        self._set_items([roll_button])
         await self.message.edit(content="キャラクターの能力値を決定します。", view=self, embed=None)
 
     async def prompt_stats_roll(self, interaction: discord.Interaction):
@@ -188,20 +214,19 @@ class CharacterCreationView(BaseOwnedView):
         random.shuffle(rolls)
         assigned_stats = dict(zip(stats_to_assign, rolls))
 
-        # 3. 仮のキャラクターオブジェクトを作成してインスタンス変数に保存
-        temp_char_data = self.character_data.copy()
-        temp_char_data["stats"] = assigned_stats
-        
-        self.temp_character = Character(temp_char_data)
-        self.temp_character.apply_race_bonus(self.options.get("races", []))
+        # 3. 仮のキャラクターオブジェクトを作成（リロール時は能力値だけ差し替える）
+        race_bonus = self.bot.world_data_loader.get_stats_bonus('fantasy_world', 'races', self.character_data.get("race"))
+        if self.temp_character is None:
+            self.temp_character = Character({**self.character_data, "stats": assigned_stats})
+            self.temp_character.apply_race_bonus(race_bonus)
+        else:
+            self.temp_character.set_stats(assigned_stats, race_bonus)
         
         embed = create_character_embed(self.temp_character)
         
         # 4. Viewのボタンを更新
-        self.clear_items()
         confirm_button = ui.Button(label="この能力値で確定する", style=discord.ButtonStyle.primary, custom_id="confirm_stats")
         confirm_button.callback = self.on_stats_confirmed
-        self.add_item(confirm_button)
 
         remaining_rerolls = self.MAX_REROLLS - self.reroll_count
         reroll_disabled = remaining_rerolls < 0
@@ -213,7 +238,7 @@ class CharacterCreationView(BaseOwnedView):
             disabled=reroll_disabled
         )
         reroll_button.callback = self.prompt_stats_roll # 自分自身を再度呼び出す
-        self.add_item(reroll_button)
+        self._set_items([confirm_button, reroll_button])
         
         # 5. メッセージをインタラクション応答として編集
         content = "以下の能力値がランダムに割り振られました。この内容で確定しますか？"
@@ -267,6 +292,12 @@ class NameInputModal(ui.Modal):
 
     char_name = ui.TextInput(label="キャラクター名", required=True, max_length=50)
     async def on_submit(self, interaction: discord.Interaction):
+        if not CharacterService.is_valid_character_name(self.char_name.value):
+            await interaction.response.send_message(
+                '名前に次の文字は使えません: \\ / * ? : " < > |\nもう一度「キャラクター作成を開始」を押して入力し直してください。',
+                ephemeral=True,
+            )
+            return
         self.view.character_data["name"] = self.char_name.value
         await interaction.response.defer(); await self.view.prompt_race_selection()
 
@@ -287,15 +318,37 @@ class ProfileInputModal(ui.Modal):
 
 class CharacterSelectView(BaseOwnedView):
     """保存されたキャラクターを選択するためのView"""
+    PAGE_SIZE = 25 # Discordのセレクトメニューに表示できる選択肢の上限
+
     def __init__(self, author_id: int, char_list: list[str], bot: "MyBot"):
         super().__init__(user_id=author_id, timeout=180)
         self.bot = bot
-        
-        options = [discord.SelectOption(label=name) for name in char_list]
-        self.select_menu = ui.Select(placeholder="ステータスを見たいキャラクターを選択...", options=options)
+        self._pages: list[tuple[str, ...]] = [
+            tuple(char_list[i:i + self.PAGE_SIZE]) for i in range(0, len(char_list), self.PAGE_SIZE)
+        ] or [()]
+        self._page_idx = 0
+
+        self.select_menu = ui.Select(placeholder="ステータスを見たいキャラクターを選択...", options=list(_char_select_options(self._pages[0])))
         self.select_menu.callback = self.on_select
         self.add_item(self.select_menu)
 
+        # 1ページに収まらない場合のみページ送りボタンを表示する
+        if len(self._pages) > 1:
+            self.prev_button = ui.Button(label="◀ 前へ", style=discord.ButtonStyle.secondary, disabled=True)
+            self.prev_button.callback = partial(self.on_page_change, step=-1)
+            self.next_button = ui.Button(label="次へ ▶", style=discord.ButtonStyle.secondary)
+            self.next_button.callback = partial(self.on_page_change, step=1)
+            self.add_item(self.prev_button)
+            self.add_item(self.next_button)
+
+    async def on_page_change(self, interaction: discord.Interaction, step: int):
+        """表示するページを切り替え、セレクトメニューの選択肢だけを差し替える"""
+        self._page_idx = max(0, min(len(self._pages) - 1, self._page_idx + step))
+        self.select_menu.options = list(_char_select_options(self._pages[self._page_idx]))
+        self.prev_button.disabled = self._page_idx == 0
+        self.next_button.disabled = self._page_idx == len(self._pages) - 1
+        await interaction.response.edit_message(view=self)
+
     async def on_select(self, interaction: discord.Interaction):
         char_name = interaction.data["values"][0]
         try:
@@ -322,6 +375,40 @@ class LevelUpView(BaseOwnedView):
         self.skill_button.callback = self.on_skill_increase
         self.add_item(self.skill_button)
 
+        # 最後にメッセージへ反映した状態 (ボタンの無効状態, キャラクターのバージョン)
+        self._last_state = (self.stat_button.disabled, self.skill_button.disabled, self.character.version)
+
+        # 最後に生成したEmbedと、その時点のキャラクターのバージョン
+        self._embed: Optional[discord.Embed] = None
+        self._embed_version: int = -1
+
+        # サブViewの選択肢キャッシュ (能力値/技能の内容が変わったときだけ作り直す)
+        self._stat_options: tuple[tuple, List[discord.SelectOption]] = ((), [])
+        self._skill_options: tuple[tuple, List[discord.SelectOption]] = ((), [])
+
+    def get_embed(self) -> discord.Embed:
+        """キャラクターに変更があった場合のみEmbedを作り直して返す"""
+        if self._embed is None or self._embed_version != self.character.version:
+            self._embed = create_character_embed(self.character)
+            self._embed_version = self.character.version
+        return self._embed
+
+    def get_stat_options(self) -> List[discord.SelectOption]:
+        """StatIncreaseView用の選択肢を返す"""
+        key = tuple(self.character.stats.items())
+        if self._stat_options[0] != key:
+            options = [discord.SelectOption(label=name, description=f"現在値: {val}") for name, val in key]
+            self._stat_options = (key, options)
+        return self._stat_options[1]
+
+    def get_skill_options(self) -> List[discord.SelectOption]:
+        """SkillSelectView用の選択肢を返す"""
+        key = tuple(self.character.skills.items())
+        if self._skill_options[0] != key:
+            options = [discord.SelectOption(label=name, description=f"現在ランク: {rank}") for name, rank in key]
+            self._skill_options = (key, options)
+        return self._skill_options[1]
+
     async def on_stat_increase(self, interaction: discord.Interaction):
         view = StatIncreaseView(self.character, self)
         await interaction.response.send_message("強化する能力値を選択してください：", view=view, ephemeral=True)
@@ -337,8 +424,13 @@ class LevelUpView(BaseOwnedView):
         self.stat_button.disabled = (self.character.stat_points <= 0)
         self.skill_button.disabled = (self.character.skill_points <= 0)
         if self.stat_button.disabled and self.skill_button.disabled: self.stop()
-        embed = create_character_embed(self.character)
-        if self.message: await self.message.edit(embed=embed, view=self)
+        # 表示内容が前回の編集から変わっていなければAPIを呼ばない
+        state = (self.stat_button.disabled, self.skill_button.disabled, self.character.version)
+        if state == self._last_state:
+            return
+        if self.message:
+            await self.message.edit(embed=self.get_embed(), view=self)
+            self._last_state = state
 
 class StatIncreaseView(ui.View):
     """能力値を強化するためのView（セレクトメニュー）"""
@@ -347,17 +439,17 @@ class StatIncreaseView(ui.View):
         self.character = character
         self.parent_view = parent_view
         
-        options = [discord.SelectOption(label=name, description=f"現在値: {val}") for name, val in character.stats.items()]
-        self.select = ui.Select(placeholder="強化する能力値を選択...", options=options)
+        self.select = ui.Select(placeholder="強化する能力値を選択...", options=list(parent_view.get_stat_options()))
         self.select.callback = self.on_select
         self.add_item(self.select)
 
     async def on_select(self, interaction: discord.Interaction):
         stat_to_increase = self.select.values[0]
         if self.character.use_stat_point(stat_to_increase):
+            # 保存や親Viewの更新より先に応答し、3秒の応答期限を超えないようにする
+            await interaction.response.edit_message(content=f"能力値 `{stat_to_increase}` を強化しました。", view=None)
             await self.parent_view.bot.character_service.save_character(interaction.user.id, self.character)
             await self.parent_view.update_view()
-            await interaction.response.edit_message(content=f"能力値 `{stat_to_increase}` を強化しました。", view=None)
         else:
             await interaction.response.send_message(f"エラー: 能力値 `{stat_to_increase}` の強化に失敗しました。", ephemeral=True)
 
@@ -368,8 +460,7 @@ class SkillSelectView(ui.View):
         self.character = character
         self.parent_view = parent_view
         
-        options = [discord.SelectOption(label=name, description=f"現在ランク: {rank}") for name, rank in character.skills.items()]
-        self.select = ui.Select(placeholder="強化する技能を選択...", options=options)
+        self.select = ui.Select(placeholder="強化する技能を選択...", options=list(parent_view.get_skill_options()))
         self.select.callback = self.on_select
         self.add_item(self.select)
 
@@ -389,12 +480,14 @@ class SkillPointsModal(ui.Modal):
         self.add_item(self.points)
 
     async def on_submit(self, interaction: discord.Interaction):
-        try:
-            points_to_use = int(self.points.value)
-            if self.character.use_skill_points(self.skill_name, points_to_use):
-                await self.parent_view.bot.character_service.save_character(interaction.user.id, self.character)
-                await interaction.response.defer(); await self.parent_view.update_view()
-            else:
-                await interaction.response.send_message(f"エラー: 技能 `{self.skill_name}` の強化に失敗しました。", ephemeral=True)
-        except ValueError:
-            await interaction.response.send_message("エラー: ポイント数には数値を入力してください。", ephemeral=True)
\ No newline at end of file
+        raw_points = self.points.value.strip()
+        if not raw_points.isdecimal():
+            await interaction.response.send_message("エラー: ポイント数には数値を入力してください。", ephemeral=True)
+            return
+
+        if self.character.use_skill_points(self.skill_name, int(raw_points)):
+            await interaction.response.defer()
+            await self.parent_view.bot.character_service.save_character(interaction.user.id, self.character)
+            await self.parent_view.update_view()
+        else:
+            await interaction.response.send_message(f"エラー: 技能 `{self.skill_name}` の強化に失敗しました。", ephemeral=True)
\ No newline at end of file
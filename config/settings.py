@@ -1,4 +1,5 @@
 import os
+from dataclasses import dataclass
 from dotenv import load_dotenv
 
 # .envファイルから環境変数を読み込む
@@ -13,17 +14,36 @@ def get_env_var(key: str, default: str = None) -> str:
         return default
     raise ValueError(f"環境変数 '{key}' が設定されていません。")
 
-# --- Bot関連 ---
-BOT_TOKEN = get_env_var("DISCORD_BOT_TOKEN")
+@dataclass(frozen=True, slots=True)
+class Settings:
+    """起動時に一度だけ環境変数から読み込まれる、アプリケーション全体の設定値。"""
+    # --- Bot関連 ---
+    bot_token: str
+    # --- チャンネルID ---
+    char_sheet_channel_id: int
+    scenario_log_channel_id: int
+    play_log_channel_id: int
+    # --- AI関連 (Ollamaを使用) ---
+    local_ai_base_url: str
+    local_ai_model_name: str
+    ai_max_concurrency: int
 
-# --- チャンネルID ---
-CHAR_SHEET_CHANNEL_ID = int(get_env_var("CHAR_SHEET_CHANNEL_ID", "0"))
-SCENARIO_LOG_CHANNEL_ID = int(get_env_var("SCENARIO_LOG_CHANNEL_ID", "0"))
-PLAY_LOG_CHANNEL_ID = int(get_env_var("PLAY_LOG_CHANNEL_ID", "0"))
+    def __post_init__(self):
+        """読み込んだ設定値を検証します。"""
+        if self.ai_max_concurrency < 1:
+            raise ValueError(
+                f"環境変数 'AI_MAX_CONCURRENCY' には1以上の整数を設定してください (現在の値: {self.ai_max_concurrency})。"
+            )
 
-# --- AI関連 (Ollamaを使用) ---
-LOCAL_AI_BASE_URL = get_env_var("AI_API_KEY", "http://127.0.0.1:11434/v1/") # OllamaのデフォルトURL
-LOCAL_AI_MODEL_NAME = get_env_var("AI_MODEL_NAME", "deepseek-r1:latest") # Ollamaで利用するモデル名
+SETTINGS = Settings(
+    bot_token=get_env_var("DISCORD_BOT_TOKEN"),
+    char_sheet_channel_id=int(get_env_var("CHAR_SHEET_CHANNEL_ID", "0")),
+    scenario_log_channel_id=int(get_env_var("SCENARIO_LOG_CHANNEL_ID", "0")),
+    play_log_channel_id=int(get_env_var("PLAY_LOG_CHANNEL_ID", "0")),
+    local_ai_base_url=get_env_var("AI_API_KEY", "http://127.0.0.1:11434/v1/"), # OllamaのデフォルトURL
+    local_ai_model_name=get_env_var("AI_MODEL_NAME", "deepseek-r1:latest"), # Ollamaで利用するモデル名
+    ai_max_concurrency=int(get_env_var("AI_MAX_CONCURRENCY", "4")), # AIサーバーへ同時に送るリクエストの上限
+)
 
 # --- 画像生成AI関連 (任意) ---
-# IMAGE_GEN_API_URL = get_env_var("IMAGE_GEN_API_URL", default=None) # 例: "http://127.0.0.1:7860/sdapi/v1/txt2img"
\ No newline at end of file
+# IMAGE_GEN_API_URL = get_env_var("IMAGE_GEN_API_URL", default=None) # 例: "http://127.0.0.1:7860/sdapi/v1/txt2img"
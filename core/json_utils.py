@@ -0,0 +1,26 @@
+"""
+このモジュールは、プロジェクト全体で使用するJSONのシリアライズ/デシリアライズ関数を提供します。
+orjson がインストールされていればそれを使用し、なければ標準ライブラリの json で代替します。
+"""
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError: # orjsonが無い環境では標準のjsonを使う
+    orjson = None
+
+# orjson.JSONDecodeError は json.JSONDecodeError のサブクラスのため、呼び出し側は後者で捕捉できる
+loads = orjson.loads if orjson is not None else json.loads
+
+def dump_bytes(data: Any) -> bytes:
+    """ファイル保存用に、インデント付きのUTF-8バイト列へシリアライズします。"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
+def dump_str(data: Any) -> str:
+    """会話履歴などに埋め込むための、改行なしのJSON文字列へシリアライズします。"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    return json.dumps(data, ensure_ascii=False)
@@ -1,6 +1,6 @@
 from typing import Dict, Optional
 import asyncio
-from collections import defaultdict
+import weakref
 
 from game.models.session import GameSession
 from game.models.character import Character
@@ -12,8 +12,11 @@ class SessionManager:
         self._sessions_by_user: Dict[int, GameSession] = {}
         # スレッドIDをキーとするセッション辞書
         self._sessions_by_thread: Dict[int, GameSession] = {}
-        # ユーザーIDごとにロックを管理するための辞書
-        self._locks: Dict[int, asyncio.Lock] = defaultdict(asyncio.Lock)
+        # ユーザーIDごとにロックを管理するための辞書 (必要になった時点で作成する)
+        # 弱参照で保持するため、誰も使っていないロックは自動的に破棄される
+        self._locks: "weakref.WeakValueDictionary[int, asyncio.Lock]" = weakref.WeakValueDictionary()
+        # セッション中のユーザーのロックは、毎回作り直さないよう強参照で保持する
+        self._session_locks: Dict[int, asyncio.Lock] = {}
 
     def has_session(self, user_id: int) -> bool:
         """指定されたユーザーのセッションが存在するかどうかを確認します。"""
@@ -28,8 +31,11 @@ class SessionManager:
         return self._sessions_by_thread.get(thread_id)
 
     def get_lock(self, user_id: int) -> asyncio.Lock:
-        """指定されたユーザーのロックオブジェクトを取得します。"""
-        return self._locks[user_id]
+        """指定されたユーザーのロックオブジェクトを取得します。存在しなければ作成します。"""
+        lock = self._locks.get(user_id)
+        if lock is None:
+            lock = self._locks[user_id] = asyncio.Lock()
+        return lock
 
     def create_session(self, user_id: int, character: Character, thread_id: int, initial_npc_states: Dict) -> GameSession:
         """新しいゲームセッションを作成または上書きします。"""
@@ -41,6 +47,7 @@ class SessionManager:
                 del self._sessions_by_thread[old_session.thread_id]
 
         session = GameSession(user_id, character, thread_id, initial_npc_states)
+        self._session_locks[user_id] = self.get_lock(user_id)
         self._sessions_by_user[user_id] = session
         self._sessions_by_thread[thread_id] = session
         print(f"--- ユーザー({user_id})のゲームセッションを作成しました (Thread: {thread_id}) ---")
@@ -52,4 +59,7 @@ class SessionManager:
             session = self._sessions_by_user.pop(user_id)
             if session and session.thread_id in self._sessions_by_thread:
                 del self._sessions_by_thread[session.thread_id]
-            print(f"--- ユーザー({user_id})のゲームセッションを削除しました ---")
\ No newline at end of file
+            print(f"--- ユーザー({user_id})のゲームセッションを削除しました ---")
+
+        # 強参照を外す (処理中のコルーチンが参照している間はロック自体は残る)
+        self._session_locks.pop(user_id, None)
\ No newline at end of file
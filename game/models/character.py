@@ -1,5 +1,6 @@
+import sys
 import uuid
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterable, List, Optional, Tuple
 
 class Character:
     """
@@ -7,6 +8,22 @@ class Character:
     DiscordのUIやデータ永続化からは独立しています。
     """
 
+    # 永続化される属性 (to_dictの出力順)
+    _FIELDS = (
+        'char_id', 'user_id', 'name', 'race', 'class_',
+        'appearance', 'background',
+        'stats', 'skills',
+        'level', 'xp', 'stat_points', 'skill_points',
+        'active_quests', 'completed_quests',
+        'inventory',
+        'hp', 'max_hp', 'mp', 'max_mp',
+    )
+    # 属性名と保存データのキーが異なるもの
+    _RENAME = {'class_': 'class'}
+
+    # __weakref__: サービス層が、キャラクターを生かし続けずにオブジェクト単位のキャッシュを持てるようにする
+    __slots__ = _FIELDS + ('_inventory_set', '_version', '_dict_cache', '_dict_cache_version', '__weakref__')
+
     def __init__(self, data: Dict[str, Any]):
         """
         辞書データからキャラクターオブジェクトを初期化します。
@@ -15,18 +32,21 @@ class Character:
             data: キャラクターの属性を含む辞書。
         """
         # --- 基本情報 ---
-        self.char_id: str = data.get('char_id', str(uuid.uuid4()))
+        char_id = data.get('char_id') # 既存データの読み込み時にUUIDを無駄に生成しないよう、無い時だけ生成する
+        self.char_id: str = char_id if char_id is not None else str(uuid.uuid4())
         self.user_id: int = data.get('user_id', 0)
         self.name: str = data.get('name', '名無し')
-        self.race: str = data.get('race', '不明')
-        self.class_: str = data.get('class', '不明') # 'class'は予約語のためアンダースコアを付与
+        # 種族・クラス名は取りうる値が少ないため、インターンして全キャラクターで同じ文字列を共有する
+        self.race: str = sys.intern(data.get('race', '不明'))
+        self.class_: str = sys.intern(data.get('class', '不明')) # 'class'は予約語のためアンダースコアを付与
 
         # --- プロフィール ---
         self.appearance: str = data.get('appearance', '')
         self.background: str = data.get('background', '')
 
         # --- 能力値・技能 ---
-        self.stats: Dict[str, int] = data.get('stats', {})
+        # 能力値名はインターンして、全キャラクターで同じ文字列を共有する (辞書検索が参照比較で済む)
+        self.stats: Dict[str, int] = {sys.intern(k): v for k, v in data.get('stats', {}).items()}
         self.skills: Dict[str, int] = data.get('skills', {})
 
         # --- 成長関連 ---
@@ -35,12 +55,13 @@ class Character:
         self.stat_points: int = data.get('stat_points', 0)
         self.skill_points: int = data.get('skill_points', 0)
 
-        # --- クエスト関連 ---
-        self.active_quests: List[str] = data.get('active_quests', [])
-        self.completed_quests: List[str] = data.get('completed_quests', [])
+        # --- クエスト関連 (順序付き集合として辞書のキーで保持し、保存時はリストに戻す) ---
+        self.active_quests: Dict[str, None] = dict.fromkeys(data.get('active_quests', []))
+        self.completed_quests: Dict[str, None] = dict.fromkeys(data.get('completed_quests', []))
 
         # --- 所持品 ---
         self.inventory: List[str] = data.get('inventory', [])
+        self._inventory_set: set[str] = set(self.inventory) # 所持判定用の索引 (順序はinventoryで保持)
 
         # --- HP/MP ---
         con_stat = self.stats.get("CON", 10) # CONがなければ10を基準
@@ -50,6 +71,16 @@ class Character:
         self.max_mp: int = data.get('max_mp', 10 + (int_stat * 2))
         self.mp: int = data.get('mp', self.max_mp)
 
+        # --- 変更カウンタ (状態が変わるたびに増加。UI側のキャッシュ判定用) ---
+        self._version: int = 0
+        self._dict_cache: Dict[str, Any] = {}
+        self._dict_cache_version: int = -1
+
+    @property
+    def version(self) -> int:
+        """状態が変更されるたびに増加するカウンタ。"""
+        return self._version
+
     @property
     def xp_to_next_level(self) -> int:
         """次のレベルアップに必要な経験値の合計。"""
@@ -60,29 +91,16 @@ class Character:
         """
         キャラクターオブジェクトの状態を辞書形式にシリアライズします。
         ファイル保存用。
+        状態が変わっていなければ前回生成した辞書をそのまま返すため、呼び出し側で変更しないでください。
         """
-        return {
-            'char_id': self.char_id,
-            'user_id': self.user_id,
-            'name': self.name,
-            'race': self.race,
-            'class': self.class_,
-            'appearance': self.appearance,
-            'background': self.background,
-            'stats': self.stats,
-            'skills': self.skills,
-            'level': self.level,
-            'xp': self.xp,
-            'stat_points': self.stat_points,
-            'skill_points': self.skill_points,
-            'active_quests': self.active_quests,
-            'completed_quests': self.completed_quests,
-            'inventory': self.inventory,
-            'hp': self.hp,
-            'max_hp': self.max_hp,
-            'mp': self.mp,
-            'max_mp': self.max_mp,
-        }
+        if self._dict_cache_version != self._version:
+            rename = self._RENAME
+            data = {rename.get(field, field): getattr(self, field) for field in self._FIELDS}
+            data['active_quests'] = list(self.active_quests)
+            data['completed_quests'] = list(self.completed_quests)
+            self._dict_cache = data
+            self._dict_cache_version = self._version
+        return self._dict_cache
 
     def add_xp(self, amount: int) -> bool:
         """
@@ -92,12 +110,15 @@ class Character:
             レベルアップした場合は True、そうでなければ False。
         """
         self.xp += amount
+        self._version += 1
         leveled_up = False
-        while self.xp >= self.xp_to_next_level:
-            self.xp -= self.xp_to_next_level
+        threshold = self.xp_to_next_level # レベルが上がった時だけ再計算する
+        while self.xp >= threshold:
+            self.xp -= threshold
             self.level += 1
             self.stat_points += 1  # レベルアップで能力値ポイント+1
             self.skill_points += 5 # レベルアップで技能ポイント+5
+            threshold = self.xp_to_next_level
             leveled_up = True
         return leveled_up
 
@@ -106,9 +127,11 @@ class Character:
         能力値ポイントを消費して指定された能力値を強化します。
         """
         stat_name = stat_name.upper()
-        if self.stat_points > 0 and stat_name in self.stats:
+        current = self.stats.get(stat_name)
+        if self.stat_points > 0 and current is not None:
             self.stat_points -= 1
-            self.stats[stat_name] += 1
+            self.stats[stat_name] = current + 1
+            self._version += 1
             return True
         return False
 
@@ -125,58 +148,88 @@ class Character:
             
         self.skill_points -= points_to_use
         self.skills[skill_name] += points_to_use
+        self._version += 1
         return True
 
-    def apply_race_bonus(self, all_races_data: List[Dict[str, Any]]):
+    def apply_race_bonus(self, stats_bonus: Iterable[Tuple[str, int]]):
         """
         種族ボーナスを能力値に適用します。
         このメソッドはキャラクター作成時に一度だけ呼び出されることを想定しています。
+
+        Args:
+            stats_bonus: このキャラクターの種族の (能力値名, 補正値) の組。
         """
-        race_data = next((race for race in all_races_data if race.get("name") == self.race), None)
-        if not race_data or "stats_bonus" not in race_data:
+        if not stats_bonus:
             return
 
-        for stat, bonus in race_data["stats_bonus"].items():
-            if stat in self.stats:
-                self.stats[stat] += bonus
+        stats = self.stats
+        for stat, bonus in stats_bonus:
+            if (current := stats.get(stat)) is not None:
+                stats[stat] = current + bonus
+        self._version += 1
+
+    def set_stats(self, stats: Dict[str, int], stats_bonus: Iterable[Tuple[str, int]]):
+        """
+        能力値を差し替え、HP/MPを再計算した上で種族ボーナスを適用し直します。
+        キャラクター作成時のリロールで、同じオブジェクトを使い回すためのメソッドです。
+        """
+        self.stats = {sys.intern(k): v for k, v in stats.items()}
+        self.max_hp = 10 + (self.stats.get("CON", 10) * 2)
+        self.hp = self.max_hp
+        self.max_mp = 10 + (self.stats.get("INT", 10) * 2)
+        self.mp = self.max_mp
+        self._version += 1
+        self.apply_race_bonus(stats_bonus)
 
     # --- インベントリ管理 ---
 
+    def has_item(self, item_name: str) -> bool:
+        """指定されたアイテムを所持しているかどうかを返します。"""
+        return item_name in self._inventory_set
+
     def add_item(self, item_name: str):
         """インベントリにアイテムを追加します。"""
-        if item_name not in self.inventory:
+        if item_name not in self._inventory_set:
+            self._inventory_set.add(item_name)
             self.inventory.append(item_name)
+            self._version += 1
 
     def remove_item(self, item_name: str) -> bool:
         """インベントリからアイテムを削除します。"""
-        if item_name in self.inventory:
-            self.inventory.remove(item_name)
-            return True
-        return False
+        if item_name not in self._inventory_set:
+            return False
+        self._inventory_set.discard(item_name)
+        self.inventory.remove(item_name)
+        self._version += 1
+        return True
 
     # --- クエスト管理 ---
 
     def start_quest(self, quest_id: str):
         """新しいクエストを開始します。"""
         if quest_id not in self.active_quests and quest_id not in self.completed_quests:
-            self.active_quests.append(quest_id)
+            self.active_quests[quest_id] = None
+            self._version += 1
 
     def complete_quest(self, quest_id: str):
         """クエストを完了状態にします。"""
-        if quest_id in self.active_quests:
-            self.active_quests.remove(quest_id)
-            if quest_id not in self.completed_quests:
-                self.completed_quests.append(quest_id)
+        if quest_id not in self.active_quests:
+            return
+        del self.active_quests[quest_id]
+        self.completed_quests.setdefault(quest_id, None)
+        self._version += 1
 
     # --- HP/MP 操作 ---
 
     def take_damage(self, amount: int):
         """HPにダメージを受けます。HPは0未満にはなりません。"""
         self.hp = max(0, self.hp - amount)
+        self._version += 1
 
     def heal_hp(self, amount: int):
         """HPを回復します。最大HPを超えることはありません。"""
         self.hp = min(self.max_hp, self.hp + amount)
+        self._version += 1
 
     def spend_mp(self, amount: int) -> bool:
         """
@@ -187,12 +240,14 @@ class Character:
         """
         if self.mp >= amount:
             self.mp -= amount
+            self._version += 1
             return True
         return False
 
     def recover_mp(self, amount: int):
         """MPを回復します。最大MPを超えることはありません。"""
         self.mp = min(self.max_mp, self.mp + amount)
+        self._version += 1
 
     @property
     def is_dead(self) -> bool:
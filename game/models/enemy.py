@@ -6,6 +6,14 @@ class Enemy:
     戦闘中の個々の敵キャラクターの状態を管理するデータモデルクラス。
     """
 
+    __slots__ = (
+        'enemy_id', 'instance_id', 'name',
+        'max_hp', 'hp',
+        'stats', 'abilities',
+        'status_effects',
+        'rewards',
+    )
+
     def __init__(self, base_data: Dict[str, Any]):
         """
         静的な敵データ（辞書）から敵オブジェクトのインスタンスを生成します。
@@ -1,14 +1,31 @@
 from typing import Dict, Any, Optional, TYPE_CHECKING
 from collections import deque
-import copy
 
 if TYPE_CHECKING:
     from .character import Character
     from .enemy import Enemy
     from infrastructure.data_loaders.world_data_loader import WorldDataLoader
 
+# 1日の時間帯の巡り (朝 -> 昼 -> 夕 -> 夜)
+_TIME_CYCLE = ("朝", "昼", "夕", "夜")
+_UNITS_PER_DAY = len(_TIME_CYCLE)
+
 class GameSession:
     """個々のゲームセッションの状態を管理するデータクラス"""
+
+    TIME_CYCLE = _TIME_CYCLE
+    # 戦闘ターンの切り替え先
+    _TURN_FLIP = {"player": "enemy", "enemy": "player"}
+
+    __slots__ = (
+        'user_id', 'character', 'thread_id', 'state', 'last_response',
+        'gm_personality', 'current_npc_id', 'npc_states', '_owned_npc_ids',
+        'difficulty_level', 'is_difficulty_manual', 'triggered_event_info',
+        'in_combat', 'current_enemies', 'combat_turn', 'victory_prompt',
+        'time_units', 'day', 'time_of_day',
+        'conversation_history',
+    )
+
     def __init__(self, user_id: int, character: "Character", thread_id: int, initial_npc_states: Dict):
         self.user_id: int = user_id
         self.character: "Character" = character
@@ -17,7 +34,9 @@ class GameSession:
         self.last_response: Optional[Dict] = None
         self.gm_personality: Optional[str] = None # プレイヤーが選択したGM人格
         self.current_npc_id: Optional[str] = None # 現在対話中のNPCのID
-        self.npc_states: Dict[str, Dict[str, Any]] = copy.deepcopy(initial_npc_states) # 世界のNPC状態をセッションにコピー
+        # 世界のNPC状態をセッションにコピー (外側のみ。各NPCの状態は更新時に複製する)
+        self.npc_states: Dict[str, Dict[str, Any]] = dict(initial_npc_states)
+        self._owned_npc_ids: set[str] = set() # このセッション用に複製済みのNPC
         self.difficulty_level: int = 1 # 動的難易度レベル
         self.is_difficulty_manual: bool = False # 難易度が手動設定されたか
         self.triggered_event_info: Optional[str] = None # 時間で発生したイベント情報
@@ -32,7 +51,6 @@ class GameSession:
         self.time_units: int = 0 # 内部的な時間単位カウンター
         self.day: int = 1
         self.time_of_day: str = "朝" # 朝 -> 昼 -> 夕 -> 夜
-        self.TIME_CYCLE = ["朝", "昼", "夕", "夜"]
 
         # --- 対話履歴 ---
         self.conversation_history: deque = deque(maxlen=10) # 直近10件のやり取りを保持
@@ -40,34 +58,35 @@ class GameSession:
     def advance_time(self, world_data_loader: "WorldDataLoader", units: int = 1):
         """指定された単位だけ時間を進め、日付と時間帯を更新する"""
         self.time_units += units
-        
-        units_per_day = len(self.TIME_CYCLE)
-        
-        self.day = 1 + (self.time_units // units_per_day)
-        self.time_of_day = self.TIME_CYCLE[self.time_units % units_per_day]
+        days, time_index = divmod(self.time_units, _UNITS_PER_DAY)
+        self.day = 1 + days
+        self.time_of_day = _TIME_CYCLE[time_index]
         
         self._check_timed_events(world_data_loader)
 
     def _check_timed_events(self, world_data_loader: "WorldDataLoader"):
         """現在の時刻に合致する時限イベントがあるか確認する"""
         self.triggered_event_info = None
-        timed_events = world_data_loader.get('fantasy_world', 'timed_events')
-        if not timed_events:
-            return
-
-        for event_id, event_data in timed_events.items():
-            trigger = event_data.get('trigger', {})
-            day_match = ('day' in trigger and self.day == trigger['day']) or \
-                        ('day_modulo' in trigger and self.day % trigger['day_modulo'] == 0)
-            time_match = 'time_of_day' in trigger and self.time_of_day == trigger['time_of_day']
-
-            if day_match and time_match:
-                self.triggered_event_info = event_data['action']['details']['narrative']
+        # 現在の時間帯に発生しうるイベントだけを調べる
+        current_day = self.day
+        for day, day_modulo, narrative in world_data_loader.get_timed_events_at('fantasy_world', self.time_of_day):
+            if (day is not None and current_day == day) or \
+               (day_modulo is not None and current_day % day_modulo == 0):
+                self.triggered_event_info = narrative
                 break
 
+    def update_npc_state(self, npc_id: str, updates: Dict[str, Any]):
+        """
+        NPCの状態を更新します。
+        世界の状態と共有しているNPCは、初めて更新する時にだけ複製します (コピーオンライト)。
+        """
+        if npc_id in self._owned_npc_ids:
+            state = self.npc_states[npc_id]
+        else:
+            state = self.npc_states[npc_id] = dict(self.npc_states.get(npc_id, {}))
+            self._owned_npc_ids.add(npc_id)
+        state.update(updates)
+
     def switch_combat_turn(self):
         """戦闘のターンを切り替えます。"""
-        if self.combat_turn == "player":
-            self.combat_turn = "enemy"
-        else:
-            self.combat_turn = "player"
\ No newline at end of file
+        self.combat_turn = self._TURN_FLIP.get(self.combat_turn, "player")
\ No newline at end of file
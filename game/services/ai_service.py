@@ -1,14 +1,24 @@
-from typing import TYPE_CHECKING, Dict, Any, List
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Tuple
+import asyncio
 import json
+import weakref
+import httpx
 from openai import AsyncOpenAI
 
 from core.errors import AIConnectionError
+from core.json_utils import loads
 
 if TYPE_CHECKING:
+    from game.models.character import Character
     from game.models.session import GameSession
     from infrastructure.data_loaders.world_data_loader import WorldDataLoader
     from infrastructure.data_loaders.prompt_loader import PromptLoader
 
+# JSON形式での応答を要求する指定 (全リクエストで共通のため使い回す)
+_JSON_RESPONSE_FORMAT = {"type": "json_object"}
+# 見つからなかった場合の既定値として共有する空の辞書 (読み取り専用として扱う)
+_EMPTY: Dict[str, Any] = {}
+
 class AIService:
     """
     AIモデルとの対話を担当するサービスクラス。
@@ -19,114 +29,203 @@ class AIService:
         base_url: str,
         model_name: str,
         world_data_loader: "WorldDataLoader",
-        prompt_loader: "PromptLoader"
+        prompt_loader: "PromptLoader",
+        http_client: Optional[httpx.AsyncClient] = None,
+        max_concurrency: int = 4,
     ):
+        """
+        Args:
+            http_client: AIサーバーとの通信に使うHTTPクライアント。
+                省略した場合はOpenAIクライアントの既定のものを使用します。
+            max_concurrency: AIサーバーへ同時に送るリクエストの上限。
+                超えた分は順番待ちとなり、サーバー側でのタイムアウトや過負荷を防ぎます。
+        """
         self.client = AsyncOpenAI(
             base_url=base_url,
             api_key="ollama", # Ollamaの場合は必須
+            http_client=http_client,
         )
         self.model_name = model_name
+        self._request_slots = asyncio.BoundedSemaphore(max_concurrency)
+        self.worlds = world_data_loader
         self.world_data = world_data_loader.get_world('fantasy_world')
+        # 世界データは起動後に変わらないため、ターンごとに参照する部分はここで取り出しておく
+        self._npcs: Dict[str, Dict[str, Any]] = self.world_data.get('npcs', {})
         self.prompts = prompt_loader
+        # キャラクターオブジェクト -> (整形時のバージョン, 整形済みのキャラクター情報)
+        # オブジェクト単位で持つため、読み込み直したキャラクター (バージョンは0から) に古い情報が使われることはなく、
+        # キャラクターが破棄されれば自動的に消える
+        self._char_info_cache: "weakref.WeakKeyDictionary[Character, Tuple[int, str]]" = weakref.WeakKeyDictionary()
+        # システムプロンプトのうち、ターンごとに変わらない部分は起動時に一度だけ組み立てる
+        self._headers: Dict[str, str] = self.prompts.get('game_master.headers', {})
+        # 静的な部分は全てプロンプトの先頭に並ぶため、連結済みの1つの文字列として保持する
+        self._static_prompt_prefix = "\n".join(filter(None, self._build_static_prompt_parts()))
+        self._combat_header = f"\n{self._headers.get('combat', '### 現在の戦闘状況')}"
+        self._npc_header = f"\n{self._headers.get('npc', '### NPCの現在の状態')}"
+        self._inventory_header = f"\n{self._headers.get('inventory', '### 所持アイテム情報')}"
+        self._intro_prompt_prefix = "\n".join(filter(None, self._build_intro_prompt_parts()))
+
+    async def close(self):
+        """AIサーバーとのHTTP接続プールを閉じます。"""
+        await self.client.close()
+
+    def _format_rules_section(self) -> str:
+        """ゲーム進行用と導入用のプロンプトで共通の、基本ルールのセクションを整形します。"""
+        world_rules = self.world_data.get('rules', '基本的なファンタジーTRPGのルールに従ってください。')
+        return f"\n{self._headers.get('rules', '### 基本ルール')}\n{world_rules}"
+
+    @staticmethod
+    def _format_response_body(response_format: Dict[str, Any]) -> str:
+        """応答フォーマットの例 (body) をプロンプトに埋め込むJSON文字列に整形します。"""
+        return json.dumps(response_format.get('body'), ensure_ascii=False, indent=2)
+
+    def _build_static_prompt_parts(self) -> Tuple[str, str]:
+        """
+        システムプロンプトの静的な部分 (セッションに依存しない部分) を組み立てます。
+
+        Returns:
+            (ベースプロンプトと基本ルール, 特殊キーワードと応答フォーマット) のタプル。
+        """
+        # 1. ベースプロンプト / 2. 基本ルール
+        head_parts = [
+            self.prompts.get('game_master.base_prompt', ''),
+            self._format_rules_section(),
+        ]
+
+        # 3. 特殊キーワード / 4. 応答フォーマット
+        special_keywords = self.prompts.get('game_master.special_keywords', {})
+        response_format = self.prompts.get('game_master.response_format', {})
+        format_body = self._format_response_body(response_format)
+        tail_parts = [
+            f"\n{special_keywords.get('victory', '')}",
+            special_keywords.get('item_use', ''),
+            f"\n{response_format.get('header', '')}\n{format_body}\n{response_format.get('footer', '')}",
+        ]
+
+        return "\n".join(filter(None, head_parts)), "\n".join(filter(None, tail_parts))
+
+    def _build_intro_prompt_parts(self) -> Tuple[str, str]:
+        """
+        導入シナリオ用システムプロンプトの静的な部分を組み立てます。
+
+        Returns:
+            (ベースプロンプトと世界設定, 応答フォーマット) のタプル。
+        """
+        # 1. ベースプロンプト / 2. 世界設定
+        head_parts = [
+            self.prompts.get('introduction.base_prompt', ''),
+            self._format_rules_section(),
+        ]
+
+        # 3. 応答フォーマット
+        response_format = self.prompts.get('introduction.response_format', {})
+        format_body = self._format_response_body(response_format)
+        tail = f"\n{response_format.get('header', '')}\n{format_body}"
+
+        return "\n".join(filter(None, head_parts)), tail
+
+    def _format_character_info(self, character: "Character", headers: Dict[str, str]) -> str:
+        """
+        プロンプト用のキャラクター情報を整形します。
+        キャラクターの状態が変わっていなければ前回の結果を再利用します。
+        """
+        cached = self._char_info_cache.get(character)
+        if cached is not None and cached[0] == character.version:
+            return cached[1]
+
+        char_info = f"""
+{headers.get('character', '### キャラクター情報')}
+名前: {character.name}
+種族: {character.race}
+クラス: {character.class_}
+能力値: {character.stats}
+技能: {character.skills}
+背景: {character.background}"""
+        self._char_info_cache[character] = (character.version, char_info)
+        return char_info
 
     def _build_system_prompt(self, session: "GameSession") -> str:
         """AIに与える役割や背景情報を定義するシステムプロンプトを構築する。"""
         
         # プロンプトの各部分をリストとして構築
         prompt_parts: List[str] = []
+        character = session.character
 
-        # 1. ベースプロンプト
-        prompt_parts.append(self.prompts.get('game_master.base_prompt', ''))
+        # 静的な部分 (ベースプロンプト / 基本ルール / 特殊キーワード / 応答フォーマット) を先頭にまとめ、
+        # ターンごとに変わる情報はその後ろに置く。先頭が毎ターン同一になり、AIサーバー側のプレフィックスキャッシュが効く。
+        # 1. ベースプロンプト / 2. 基本ルール / 3. 特殊キーワード / 4. 応答フォーマット (起動時に連結済み)
+        prompt_parts.append(self._static_prompt_prefix)
 
-        # 2. 基本ルール
-        headers = self.prompts.get('game_master.headers', {})
-        world_rules = self.world_data.get('rules', '基本的なファンタジーTRPGのルールに従ってください。')
-        prompt_parts.append(f"\n{headers.get('rules', '### 基本ルール')}\n{world_rules}")
+        # 5. キャラクター情報
+        prompt_parts.append(self._format_character_info(character, self._headers))
 
-        # 3. キャラクター情報
-        char_info = f"""
-{headers.get('character', '### キャラクター情報')}
-名前: {session.character.name}
-種族: {session.character.race}
-クラス: {session.character.class_}
-能力値: {session.character.stats}
-技能: {session.character.skills}
-背景: {session.character.background}"""
-        prompt_parts.append(char_info)
-
-        # 4. 戦闘中の情報
+        # 6. 戦闘中の情報
+        # 各セクションは行のリストとして組み立て、最後に一度だけ連結する
         if session.in_combat:
-            combat_info = f"\n{headers.get('combat', '### 現在の戦闘状況')}\n"
+            combat_lines = [self._combat_header]
             if session.combat_turn == "player":
-                combat_info += "現在のターン: **プレイヤー**。プレイヤーの行動に対する結果を描写してください。\n"
+                combat_lines.append("現在のターン: **プレイヤー**。プレイヤーの行動に対する結果を描写してください。")
             else:
-                combat_info += "現在のターン: **敵**。敵の行動を決定し、その結果を描写してください。\n"
-            combat_info += "敵:\n"
-            for enemy in session.current_enemies:
-                combat_info += f"- {enemy.name} (HP: {enemy.hp}/{enemy.max_hp}, ID: {enemy.instance_id})\n"
-            prompt_parts.append(combat_info)
+                combat_lines.append("現在のターン: **敵**。敵の行動を決定し、その結果を描写してください。")
+            combat_lines.append("敵:")
+            combat_lines.extend(
+                f"- {enemy.name} (HP: {enemy.hp}/{enemy.max_hp}, ID: {enemy.instance_id})"
+                for enemy in session.current_enemies
+            )
+            combat_lines.append("")
+            prompt_parts.append("\n".join(combat_lines))
 
-        # 5. NPCの現在の状態
+        # 7. NPCの現在の状態
         if session.npc_states:
-            npc_info = f"\n{headers.get('npc', '### NPCの現在の状態')}\n"
-            all_npcs = self.world_data.get('npcs', {})
+            npc_lines = [self._npc_header]
+            all_npcs = self._npcs
             for npc_id, npc_state in session.npc_states.items():
-                npc_base_info = all_npcs.get(npc_id, {})
+                npc_base_info = all_npcs.get(npc_id) or _EMPTY
                 npc_name = npc_base_info.get('name', '不明なNPC')
-                npc_info += f"- {npc_name} (ID: {npc_id}): {npc_state}\n"
-            prompt_parts.append(npc_info)
-
-        # 6. インベントリ内のアイテム情報
-        if session.character.inventory:
-            inventory_info = f"\n{headers.get('inventory', '### 所持アイテム情報')}\n"
-            all_items = self.world_data.get('items', {})
-            for item_name in session.character.inventory:
-                item_data = all_items.get(item_name.lower().replace(" ", "_"), {})
-                item_desc = item_data.get('description', '効果不明のアイテム。')
-                inventory_info += f"- {item_name}: {item_desc}\n"
-            prompt_parts.append(inventory_info)
-        
-        # 7. 特殊キーワード
-        special_keywords = self.prompts.get('game_master.special_keywords', {})
-        prompt_parts.append(f"\n{special_keywords.get('victory', '')}")
-        prompt_parts.append(special_keywords.get('item_use', ''))
+                npc_lines.append(f"- {npc_name} (ID: {npc_id}): {npc_state}")
+            npc_lines.append("")
+            prompt_parts.append("\n".join(npc_lines))
 
-        # 8. 応答フォーマット
-        response_format = self.prompts.get('game_master.response_format', {})
-        format_body = json.dumps(response_format.get('body'), ensure_ascii=False, indent=2)
-        prompt_parts.append(f"\n{response_format.get('header', '')}\n{format_body}\n{response_format.get('footer', '')}")
+        # 8. インベントリ内のアイテム情報
+        if character.inventory:
+            inventory_lines = [self._inventory_header]
+            get_item = self.worlds.get_item
+            for item_name in character.inventory:
+                item_data = get_item('fantasy_world', item_name) or _EMPTY
+                item_desc = item_data.get('description', '効果不明のアイテム。')
+                inventory_lines.append(f"- {item_name}: {item_desc}")
+            inventory_lines.append("")
+            prompt_parts.append("\n".join(inventory_lines))
 
         return "\n".join(filter(None, prompt_parts))
 
 
-    def _build_messages(self, session: "GameSession", user_input: str) -> list[dict]:
+    def _build_messages(self, session: "GameSession", system_prompt: str, user_input: str) -> list[dict]:
         """AIに送信するメッセージのリストを構築する。"""
-        messages = []
-        # 過去の対話履歴を追加
-        for entry in session.conversation_history:
-            messages.append({"role": entry["role"], "content": entry["content"]})
-            
-        # 今回のプレイヤーの行動を追加
-        messages.append({"role": "user", "content": user_input})
-        
-        return messages
+        # システムプロンプト、過去の対話履歴 (既に role/content 形式の辞書)、今回のプレイヤーの行動の順に並べる
+        return [
+            {"role": "system", "content": system_prompt},
+            *session.conversation_history,
+            {"role": "user", "content": user_input},
+        ]
 
     async def generate_game_response(self, session: "GameSession", user_input: str) -> Dict[str, Any]:
         """
         プレイヤーの入力に基づき、AIからゲームの応答を生成します。
         """
         system_prompt = self._build_system_prompt(session)
-        messages = self._build_messages(session, user_input)
+        messages = self._build_messages(session, system_prompt, user_input)
 
         try:
-            response = await self.client.chat.completions.create(
-                model=self.model_name,
-                messages=[{"role": "system", "content": system_prompt}] + messages,
-                temperature=0.7,
-                response_format={"type": "json_object"},
-            )
+            async with self._request_slots:
+                response = await self.client.chat.completions.create(
+                    model=self.model_name,
+                    messages=messages,
+                    temperature=0.7,
+                    response_format=_JSON_RESPONSE_FORMAT,
+                )
             response_content = response.choices[0].message.content
-            return json.loads(response_content)
+            return loads(response_content)
         except Exception as e:
             raise AIConnectionError(f"AIからの応答生成に失敗しました: {e}") from e
 
@@ -135,44 +234,24 @@ class AIService:
         ゲーム開始時の導入シナリオをAIから生成します。
         """
         # 導入用のシステムプロンプトを構築
-        prompt_parts: List[str] = []
-        headers = self.prompts.get('game_master.headers', {})
-        
-        # 1. ベースプロンプト
-        prompt_parts.append(self.prompts.get('introduction.base_prompt', ''))
-
-        # 2. 世界設定
-        world_rules = self.world_data.get('rules', '基本的なファンタジーTRPGのルールに従ってください。')
-        prompt_parts.append(f"\n{headers.get('rules', '### 基本ルール')}\n{world_rules}")
-
-        # 3. キャラクター情報
-        char_info = f"""
-{headers.get('character', '### キャラクター情報')}
-名前: {session.character.name}
-種族: {session.character.race}
-クラス: {session.character.class_}
-能力値: {session.character.stats}
-技能: {session.character.skills}
-背景: {session.character.background}"""
-        prompt_parts.append(char_info)
-
-        # 4. 応答フォーマット
-        response_format = self.prompts.get('introduction.response_format', {})
-        format_body = json.dumps(response_format.get('body'), ensure_ascii=False, indent=2)
-        prompt_parts.append(f"\n{response_format.get('header', '')}\n{format_body}")
-        
+        # ベースプロンプト・世界設定・応答フォーマットは起動時に組み立て済みで、キャラクター情報の前に置く
+        prompt_parts: List[str] = [
+            self._intro_prompt_prefix,
+            self._format_character_info(session.character, self._headers),
+        ]
         system_prompt = "\n".join(filter(None, prompt_parts))
 
         try:
-            response = await self.client.chat.completions.create(
-                model=self.model_name,
-                messages=[{"role": "system", "content": system_prompt}],
-                temperature=0.8, # 少し創造性を高める
-                response_format={"type": "json_object"},
-            )
+            async with self._request_slots:
+                response = await self.client.chat.completions.create(
+                    model=self.model_name,
+                    messages=[{"role": "system", "content": system_prompt}],
+                    temperature=0.8, # 少し創造性を高める
+                    response_format=_JSON_RESPONSE_FORMAT,
+                )
             response_content = response.choices[0].message.content
             # 生成された導入を最初の会話として履歴に追加
             session.conversation_history.append({"role": "assistant", "content": response_content})
-            return json.loads(response_content)
+            return loads(response_content)
         except Exception as e:
             raise AIConnectionError(f"AIからの導入シナリオ生成に失敗しました: {e}") from e
\ No newline at end of file
@@ -2,11 +2,14 @@ import uuid
 from typing import Dict, Any, List, TYPE_CHECKING
 
 from game.models.character import Character
-from core.errors import CharacterNotFoundError
+from core.errors import CharacterNotFoundError, GameError
 
 if TYPE_CHECKING:
     from infrastructure.repositories.file_repository import FileRepository
 
+# キャラクター名はセーブファイル名になるため、ファイル名に使えない文字を含む名前は作成時に拒否する
+INVALID_NAME_CHARS = frozenset('\\/*?:"<>|')
+
 class CharacterService:
     """
     キャラクターに関するビジネスロジックを扱うサービスクラス。
@@ -19,6 +22,11 @@ class CharacterService:
         """
         self.repository = character_repository
 
+    @staticmethod
+    def is_valid_character_name(name: str) -> bool:
+        """キャラクター名として (=セーブファイル名として) 使える名前かどうかを判定します。"""
+        return bool(name.strip()) and INVALID_NAME_CHARS.isdisjoint(name)
+
     async def create_character(self, user_id: int, char_data: Dict[str, Any]) -> Character:
         """
         新しいキャラクターを作成し、永続化します。
@@ -30,6 +38,9 @@ class CharacterService:
         Returns:
             作成されたCharacterオブジェクト。
         """
+        if not self.is_valid_character_name(char_data.get('name', '')):
+            raise GameError("キャラクター名に使用できない文字が含まれています。")
+
         # サーバー側で管理するIDを付与
         char_data['user_id'] = user_id
         if 'char_id' not in char_data:
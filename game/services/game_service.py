@@ -2,11 +2,12 @@ from typing import TYPE_CHECKING, Optional, Dict, Any, Tuple, List
 import discord
 import random
 # from io import BytesIO
-import json
 
 from core.errors import GameError
+from core.json_utils import dump_str
 from game.models.session import GameSession
 from game.models.enemy import Enemy
+from game.models.character import Character
 
 if TYPE_CHECKING:
     from game.managers.session_manager import SessionManager
@@ -22,6 +23,12 @@ class GameService:
     ゲームの主要なビジネスロジック（セッション管理、ゲーム進行など）を扱うサービスクラス。
     プレゼンテーション層（Cogs）と他のゲームコンポーネントとの間のファサードとして機能します。
     """
+    # AIが返すクエストの状態と、それに対応するキャラクターの操作
+    _QUEST_STATUS_HANDLERS = {
+        "active": Character.start_quest,
+        "completed": Character.complete_quest,
+    }
+
     def __init__(
         self,
         session_manager: "SessionManager",
@@ -168,7 +175,7 @@ class GameService:
 
         # 対話履歴を更新
         session.conversation_history.append({"role": "user", "content": user_input})
-        session.conversation_history.append({"role": "assistant", "content": json.dumps(ai_response, ensure_ascii=False)})
+        session.conversation_history.append({"role": "assistant", "content": dump_str(ai_response)})
 
         # 時間を経過させる
         session.advance_time(self.worlds)
@@ -263,7 +270,7 @@ class GameService:
             raise GameError("アクティブなゲームセッションがありません。")
 
         # プレイヤーがアイテムを所持しているか確認
-        if not item_name in session.character.inventory:
+        if not session.character.has_item(item_name):
             raise GameError(f"アイテム「{item_name}」を所持していません。")
 
         # アイテムを消費
@@ -313,61 +320,74 @@ class GameService:
 
     def _apply_state_changes(self, session: GameSession, state_changes: Dict[str, Any]):
         """AIの応答に基づいてキャラクターの状態を更新する"""
+        if not state_changes or not isinstance(state_changes, dict):
+            return # 変更なし、またはAIが不正な値を返した場合は何もしない
         character = session.character
+        get = state_changes.get
 
-        if xp_gain := state_changes.get("xp_gain"):
+        if xp_gain := get("xp_gain"):
             if isinstance(xp_gain, int) and xp_gain > 0:
                 character.add_xp(xp_gain)
 
-        if hp_change := state_changes.get("hp_change"):
+        if hp_change := get("hp_change"):
             if isinstance(hp_change, int):
                 if hp_change < 0:
                     character.take_damage(abs(hp_change))
                 else:
                     character.heal_hp(hp_change)
 
-        if mp_change := state_changes.get("mp_change"):
+        if mp_change := get("mp_change"):
             if isinstance(mp_change, int):
                 if mp_change < 0:
                     character.spend_mp(abs(mp_change))
                 else:
                     character.recover_mp(mp_change)
 
-        if new_items := state_changes.get("new_items"):
+        if new_items := get("new_items"):
             if isinstance(new_items, list):
+                add_item = character.add_item
                 for item in new_items:
-                    character.add_item(item)
+                    if isinstance(item, str): # 所持品は名前の集合で管理するため、文字列以外は無視する
+                        add_item(item)
 
-        if quest_updates := state_changes.get("quest_updates"):
+        if quest_updates := get("quest_updates"):
             if isinstance(quest_updates, dict):
+                handlers = self._QUEST_STATUS_HANDLERS
                 for quest_id, status in quest_updates.items():
-                    if status == "active":
-                        character.start_quest(quest_id)
-                    elif status == "completed":
-                        character.complete_quest(quest_id)
+                    # AIが文字列以外 (辞書やリストなど) を返した場合は無視する (辞書の検索で例外になるため)
+                    if isinstance(status, str) and (handler := handlers.get(status)):
+                        handler(character, quest_id)
 
-        if npc_updates := state_changes.get("npc_updates"):
+        if npc_updates := get("npc_updates"):
             if isinstance(npc_updates, dict):
+                update_npc_state = session.update_npc_state
                 for npc_id, updates in npc_updates.items():
-                    if npc_id not in session.npc_states:
-                        session.npc_states[npc_id] = {}
-                    session.npc_states[npc_id].update(updates)
+                    # AIが辞書以外を返した場合は無視する (dict.updateが例外を投げるため)
+                    if not isinstance(updates, dict):
+                        continue
+                    update_npc_state(npc_id, updates)
 
-        if enemy_damage_list := state_changes.get("enemy_damage"):
+        if enemy_damage_list := get("enemy_damage"):
             if isinstance(enemy_damage_list, list):
+                # 1応答で複数の敵に言及されても線形探索を繰り返さないよう、IDで引ける辞書を用意する
+                enemies_by_id = {e.instance_id: e for e in session.current_enemies}
                 for damage_info in enemy_damage_list:
+                    if not isinstance(damage_info, dict):
+                        continue
                     target_id = damage_info.get("instance_id")
                     damage = damage_info.get("damage")
                     if target_id and isinstance(damage, int) and damage > 0:
-                        target_enemy = next((e for e in session.current_enemies if e.instance_id == target_id), None)
+                        target_enemy = enemies_by_id.get(target_id)
                         if target_enemy:
                             target_enemy.take_damage(damage)
                             print(f"敵「{target_enemy.name}」({target_id}) に {damage} のダメージを与えた。残りHP: {target_enemy.hp}")
 
-                defeated_enemies_this_turn = [e for e in session.current_enemies if e.is_defeated()]
-
-                # 倒された敵を戦闘リストから削除
-                session.current_enemies = [e for e in session.current_enemies if not e.is_defeated()]
+                # 倒された敵を戦闘リストから削除 (一度の走査で振り分ける)
+                defeated_enemies_this_turn = []
+                remaining_enemies = []
+                for enemy in session.current_enemies:
+                    (defeated_enemies_this_turn if enemy.is_defeated() else remaining_enemies).append(enemy)
+                session.current_enemies = remaining_enemies
                 
                 # プレイヤーの攻撃によって全ての敵が倒されたかチェック
                 if not session.current_enemies:
@@ -381,7 +401,7 @@ class GameService:
                     # AIに勝利の報告と報酬の内容を伝えて、描写を生成させる
                     session.victory_prompt = f"戦闘勝利。報酬として経験値{xp_reward}とアイテム{', '.join(items_reward) if items_reward else 'なし'}を獲得した。この勝利の瞬間を描写してください。"
 
-        if combat_updates := state_changes.get("combat"):
+        if combat_updates := get("combat"):
             if isinstance(combat_updates, dict):
                 status = combat_updates.get("status")
                 if status == "start":
@@ -1,6 +1,14 @@
 import json
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Tuple
+
+_MISSING = object()
+
+@lru_cache(maxsize=256)
+def _split_key(key: str) -> Tuple[str, ...]:
+    """ドット記法のキーを分割します。キーの種類は限られているため結果を使い回します。"""
+    return tuple(key.split('.'))
 
 class PromptLoader:
     """プロンプト設定ファイル (JSON) を読み込み、管理するクラス。"""
@@ -15,7 +23,7 @@ class PromptLoader:
             raise FileNotFoundError(f"プロンプトファイルが見つかりません: {file_path}")
         
         with open(file_path, 'r', encoding='utf-8') as f:
-            self._prompts: Dict[str, Any] = json.load(f)
+            self._prompts: Dict[str, Any] = json.loads(f.read())
         
         print(f"プロンプトファイルをロードしました: {file_path}")
 
@@ -24,14 +32,14 @@ class PromptLoader:
         ドット記法を使用して、ネストされたプロンプトの値を取得します。
         例: get('game_master.response_format.header')
         """
-        keys = key.split('.')
         value = self._prompts
-        try:
-            for k in keys:
-                value = value[k]
-            return value
-        except (KeyError, TypeError):
-            return default
+        for k in _split_key(key):
+            if type(value) is not dict:
+                return default
+            value = value.get(k, _MISSING)
+            if value is _MISSING:
+                return default
+        return value
 
     def get_raw(self) -> Dict[str, Any]:
         """ロードしたプロンプト全体の辞書を返します。"""
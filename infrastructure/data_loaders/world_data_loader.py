@@ -1,6 +1,7 @@
 import json
+import sys
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 
 class WorldDataLoader:
     """
@@ -13,6 +14,14 @@ class WorldDataLoader:
         """
         self.base_path = Path(base_path)
         self._world_data: Dict[str, Any] = {}
+        # 世界名 -> 種別('races'/'classes') -> 名前 -> データ の索引
+        self._creation_index: Dict[str, Dict[str, Dict[str, Dict[str, Any]]]] = {}
+        # 世界名 -> 種別('races'/'classes') -> 名前 -> (能力値名, 補正値) の組 の索引
+        self._stats_bonus_index: Dict[str, Dict[str, Dict[str, Tuple[Tuple[str, int], ...]]]] = {}
+        # 世界名 -> アイテム名 (別名を含む) -> アイテムデータ
+        self._item_index: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        # 世界名 -> 時間帯 -> (日, 日の周期, ナレーション) のリスト
+        self._timed_events_index: Dict[str, Dict[str, List[Tuple[Optional[int], Optional[int], str]]]] = {}
         self._load_all_data()
 
     def _load_all_data(self):
@@ -27,12 +36,130 @@ class WorldDataLoader:
         for file_path in self.base_path.glob("*.json"):
             try:
                 with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                    data = json.loads(f.read())
                     self._world_data[file_path.stem] = data
+                    self._creation_index[file_path.stem] = self._build_creation_index(data)
+                    self._stats_bonus_index[file_path.stem] = self._build_stats_bonus_index(self._creation_index[file_path.stem])
+                    self._timed_events_index[file_path.stem] = self._build_timed_events_index(data)
+                    self._item_index[file_path.stem] = self._build_item_index(data)
                     print(f"世界データをロードしました: {file_path.name}")
             except (json.JSONDecodeError, FileNotFoundError) as e:
                 print(f"エラー: 世界データ '{file_path.name}' の読み込みに失敗しました。 - {e}")
 
+    @staticmethod
+    def _build_creation_index(world: Dict[str, Any]) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """creation_options の各リストを名前で引ける辞書に変換します。"""
+        options = world.get("creation_options") or {}
+        return {
+            kind: {entry["name"]: entry for entry in entries if "name" in entry}
+            for kind, entries in options.items()
+            if isinstance(entries, list)
+        }
+
+    @staticmethod
+    def _build_timed_events_index(world: Dict[str, Any]) -> Dict[str, List[Tuple[Optional[int], Optional[int], str]]]:
+        """timed_events を発生する時間帯ごとにまとめ、判定に必要な値だけを取り出します。"""
+        index: Dict[str, List[Tuple[Optional[int], Optional[int], str]]] = {}
+        for event_data in (world.get("timed_events") or {}).values():
+            trigger = event_data.get("trigger", {})
+            time_of_day = trigger.get("time_of_day")
+            narrative = event_data.get("action", {}).get("details", {}).get("narrative")
+            if time_of_day is None or narrative is None:
+                continue # 時間帯の指定がないイベントは発生しない
+            day = trigger.get("day")
+            day_modulo = trigger.get("day_modulo") or None # 0 は周期として扱わない
+            index.setdefault(time_of_day, []).append((day, day_modulo, narrative))
+        return index
+
+    @staticmethod
+    def _build_stats_bonus_index(
+        creation_index: Dict[str, Dict[str, Dict[str, Any]]]
+    ) -> Dict[str, Dict[str, Tuple[Tuple[str, int], ...]]]:
+        """
+        種族・クラスごとの能力値ボーナスを (能力値名, 補正値) の組にまとめた索引を作ります。
+        元の世界データには手を加えません。
+        """
+        return {
+            kind: {name: WorldDataLoader._build_stats_bonus_pairs(entry) for name, entry in entries.items()}
+            for kind, entries in creation_index.items()
+        }
+
+    @staticmethod
+    def _build_stats_bonus_pairs(entry: Dict[str, Any]) -> Tuple[Tuple[str, int], ...]:
+        """
+        種族・クラスの能力値ボーナスを (能力値名, 補正値) の組にまとめます。
+        `stats_bonus` (能力値名 -> 補正値) と `bonus` ({"stat", "value"}) のどちらの書式にも対応します。
+        """
+        stats_bonus = entry.get("stats_bonus")
+        pairs = list(stats_bonus.items()) if isinstance(stats_bonus, dict) else []
+        bonus = entry.get("bonus")
+        if isinstance(bonus, dict) and "stat" in bonus:
+            pairs.append((bonus["stat"], bonus.get("value", 0)))
+        return tuple((sys.intern(stat), value) for stat, value in pairs)
+
+    @staticmethod
+    def _build_item_index(world: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """アイテムのキーと表示名 (name) の両方から引ける索引を作ります。"""
+        items = world.get("items") or {}
+        index = dict(items)
+        for item_data in items.values():
+            if isinstance(item_data, dict) and "name" in item_data:
+                index.setdefault(item_data["name"], item_data)
+        return index
+
+    def get_item(self, world_name: str, item_name: str) -> Optional[Dict[str, Any]]:
+        """
+        アイテム名からアイテムデータを取得します。
+        見つからない場合は正規化した名前 (小文字・空白をアンダースコアに) で引き直し、
+        見つかった別名は次回から直接引けるよう索引に登録します。
+
+        Args:
+            world_name: 取得元の世界の名前 (例: 'fantasy_world')
+            item_name: 所持品などに記録されているアイテム名
+        """
+        index = self._item_index.get(world_name)
+        if index is None:
+            return None
+        item_data = index.get(item_name)
+        if item_data is None:
+            item_data = index.get(item_name.lower().replace(" ", "_"))
+            if item_data is not None:
+                index[item_name] = item_data
+        return item_data
+
+    def get_timed_events_at(self, world_name: str, time_of_day: str) -> List[Tuple[Optional[int], Optional[int], str]]:
+        """
+        指定された時間帯に発生しうる時限イベントを (日, 日の周期, ナレーション) のリストで取得します。
+
+        Args:
+            world_name: 取得元の世界の名前 (例: 'fantasy_world')
+            time_of_day: 時間帯 (例: '朝')
+        """
+        return self._timed_events_index.get(world_name, {}).get(time_of_day, [])
+
+    def get_creation_option(self, world_name: str, kind: str, name: str) -> Optional[Dict[str, Any]]:
+        """
+        キャラクター作成の選択肢(種族・クラスなど)を名前から取得します。
+
+        Args:
+            world_name: 取得元の世界の名前 (例: 'fantasy_world')
+            kind: 選択肢の種別 (例: 'races', 'classes')
+            name: 取得したい選択肢の名前
+        """
+        return self._creation_index.get(world_name, {}).get(kind, {}).get(name)
+
+    def get_stats_bonus(self, world_name: str, kind: str, name: str) -> Tuple[Tuple[str, int], ...]:
+        """
+        種族・クラスの能力値ボーナスを (能力値名, 補正値) の組で取得します。
+        ボーナスがない、または選択肢が見つからない場合は空のタプルを返します。
+
+        Args:
+            world_name: 取得元の世界の名前 (例: 'fantasy_world')
+            kind: 選択肢の種別 (例: 'races', 'classes')
+            name: 選択肢の名前
+        """
+        return self._stats_bonus_index.get(world_name, {}).get(kind, {}).get(name, ())
+
     def get(self, world_name: str, key: str) -> Optional[Any]:
         """
         指定された世界のデータから、キーに対応する値を取得します。
@@ -1,9 +1,16 @@
+import asyncio
 import json
-import aiofiles
+import os
+import uuid
+import weakref
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 
 from core.errors import FileOperationError
+from core.json_utils import dump_bytes, loads
+
+# Characters that would let a save name point outside the user's directory.
+_PATH_SEPARATORS = ('/', '\\', '\0')
 
 class FileRepository:
     """
@@ -18,15 +25,36 @@ class FileRepository:
         """
         self.base_path = Path(base_path)
         self.base_path.mkdir(parents=True, exist_ok=True)
+        # User directories that have already been created, so mkdir runs once per user.
+        self._user_dirs: Dict[int, Path] = {}
+        # One lock per save file, so overlapping saves land in the order they were issued.
+        # Held weakly: a lock disappears once no save of that file is in progress.
+        self._path_locks: "weakref.WeakValueDictionary[Path, asyncio.Lock]" = weakref.WeakValueDictionary()
 
     def _get_user_dir(self, user_id: int) -> Path:
         """Gets the directory path for a user, creating it if it doesn't exist."""
-        user_dir = self.base_path / str(user_id)
-        user_dir.mkdir(exist_ok=True)
+        user_dir = self._user_dirs.get(user_id)
+        if user_dir is None:
+            user_dir = self.base_path / str(user_id)
+            user_dir.mkdir(exist_ok=True)
+            self._user_dirs[user_id] = user_dir
         return user_dir
 
+    def _get_path_lock(self, file_path: Path) -> asyncio.Lock:
+        """Gets the lock that serializes writes to a save file, creating it if needed."""
+        lock = self._path_locks.get(file_path)
+        if lock is None:
+            lock = self._path_locks[file_path] = asyncio.Lock()
+        return lock
+
     def _get_save_path(self, user_id: int, save_name: str) -> Path:
-        """Gets the full path for a save file."""
+        """
+        Gets the full path for a save file.
+        The name is used as-is, so distinct names never share a file; names that
+        could escape the user directory are rejected instead of being rewritten.
+        """
+        if any(sep in save_name for sep in _PATH_SEPARATORS):
+            raise FileOperationError(f"Invalid save name '{save_name}'.")
         return self._get_user_dir(user_id) / f"{save_name}.json"
 
     async def save(self, user_id: int, save_name: str, data: Dict[str, Any]):
@@ -40,11 +68,34 @@ class FileRepository:
         """
         file_path = self._get_save_path(user_id, save_name)
         try:
-            async with aiofiles.open(file_path, mode='w', encoding='utf-8') as f:
-                await f.write(json.dumps(data, indent=4, ensure_ascii=False))
+            # Saves of the same file are serialized, so an older payload can never replace a newer one.
+            async with self._get_path_lock(file_path):
+                # Serialize on the event loop so the data cannot change mid-write,
+                # then hand the blocking write to a worker thread in a single hop.
+                payload = dump_bytes(data)
+                await asyncio.to_thread(self._write_atomic, file_path, payload)
         except Exception as e:
             raise FileOperationError(f"Failed to save file '{file_path}'.") from e
 
+    @staticmethod
+    def _write_atomic(file_path: Path, payload: bytes):
+        """
+        Writes to a temporary file and swaps it into place, so a crash mid-write
+        never leaves a truncated save behind. Runs in a worker thread.
+        The temporary name is unique per write, so overlapping saves of the same
+        file never share (and corrupt) one temporary file.
+        """
+        tmp_path = file_path.with_name(f"{file_path.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, file_path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
     async def load(self, user_id: int, save_name: str) -> Optional[Dict[str, Any]]:
         """
         Asynchronously loads a JSON file and returns its data.
@@ -57,27 +108,39 @@ class FileRepository:
             The loaded data, or None if the file does not exist.
         """
         file_path = self._get_save_path(user_id, save_name)
-        if not file_path.exists():
+        try:
+            content = await asyncio.to_thread(file_path.read_bytes)
+        except FileNotFoundError:
             return None
 
         try:
-            async with aiofiles.open(file_path, mode='r', encoding='utf-8') as f:
-                content = await f.read()
-                return json.loads(content)
-        except (FileNotFoundError, json.JSONDecodeError) as e:
+            return loads(content)
+        except json.JSONDecodeError as e:
             raise FileOperationError(f"Failed to load file '{file_path}'.") from e
 
     async def list_saves(self, user_id: int) -> List[str]:
         """Returns a list of saved data (file names) for a given user."""
-        user_dir = self._get_user_dir(user_id)
-        if not user_dir.exists():
+        return await asyncio.to_thread(self._scan_saves, self.base_path / str(user_id))
+
+    @staticmethod
+    def _scan_saves(user_dir: Path) -> List[str]:
+        """Lists the save names in a user directory. Runs in a worker thread."""
+        try:
+            with os.scandir(user_dir) as entries:
+                return [e.name[:-5] for e in entries if e.name.endswith('.json') and e.is_file()]
+        except FileNotFoundError:
             return []
-        return [p.stem for p in user_dir.glob('*.json') if p.is_file()]
 
     async def delete(self, user_id: int, save_name: str) -> bool:
         """Deletes a specified save file."""
         file_path = self._get_save_path(user_id, save_name)
-        if file_path.exists() and file_path.is_file():
+        async with self._get_path_lock(file_path):
+            return await asyncio.to_thread(self._delete_file, file_path)
+
+    @staticmethod
+    def _delete_file(file_path: Path) -> bool:
+        """Deletes the file if it exists. Runs in a worker thread."""
+        if file_path.is_file():
             file_path.unlink()
             return True
         return False
\ No newline at end of file
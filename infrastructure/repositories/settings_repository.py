@@ -1,10 +1,14 @@
+import asyncio
 import json
+import os
+import uuid
 import aiofiles
 from pathlib import Path
 from typing import Dict, Any, Optional
 import logging
 
 from core.errors import FileOperationError
+from core.json_utils import dump_bytes, loads
 
 logger = logging.getLogger(__name__)
 
@@ -13,12 +17,21 @@ class SettingsRepository:
     Handles reading and writing of guild-specific settings to a JSON file.
     """
 
-    def __init__(self, settings_path: str):
+    def __init__(self, settings_path: str, flush_delay: float = 0.5):
         """
         Args:
             settings_path: The path to the JSON file for storing settings.
+            flush_delay: Seconds to wait after a change before writing the file,
+                so that bursts of changes are written once.
         """
         self.settings_file = Path(settings_path)
+        self.flush_delay = flush_delay
+        # All settings, loaded from the file on first access and kept in memory afterwards.
+        self._cache: Optional[Dict[str, Any]] = None
+        self._dirty = False
+        self._flush_task: Optional[asyncio.Task] = None
+        self._write_lock = asyncio.Lock()
+        self._load_lock = asyncio.Lock()
         self.settings_file.parent.mkdir(parents=True, exist_ok=True)
         # To ensure the file exists, touch it if it doesn't.
         if not self.settings_file.is_file():
@@ -26,14 +39,24 @@ class SettingsRepository:
             self.settings_file.write_text('{}')
 
     async def _load_all_settings(self) -> Dict[str, Any]:
+        """Returns all settings, reading the JSON file only on first access."""
+        if self._cache is None:
+            # Concurrent first reads share one file read, so a late read cannot
+            # replace a cache that has already been modified.
+            async with self._load_lock:
+                if self._cache is None:
+                    self._cache = await self._read_settings_file()
+        return self._cache
+
+    async def _read_settings_file(self) -> Dict[str, Any]:
         """Loads all settings from the JSON file."""
         try:
-            async with aiofiles.open(self.settings_file, mode='r', encoding='utf-8') as f:
+            async with aiofiles.open(self.settings_file, mode='rb') as f:
                 content = await f.read()
                 # If file is empty, return empty dict
                 if not content:
                     return {}
-                return json.loads(content)
+                return loads(content)
         except json.JSONDecodeError:
             logger.warning(f"Settings file '{self.settings_file}' contains invalid JSON. Starting fresh.")
             return {}
@@ -45,10 +68,16 @@ class SettingsRepository:
 
     async def _save_all_settings(self, all_settings: Dict[str, Any]):
         """Saves all settings to the JSON file."""
+        # Write to a temporary file and swap it into place, so a crash mid-write
+        # never leaves a truncated settings file behind. The temporary name is unique
+        # per write so that no two writes ever share a temporary file.
+        tmp_path = self.settings_file.with_name(f"{self.settings_file.name}.{uuid.uuid4().hex}.tmp")
         try:
-            async with aiofiles.open(self.settings_file, mode='w', encoding='utf-8') as f:
-                await f.write(json.dumps(all_settings, indent=4, ensure_ascii=False))
+            async with aiofiles.open(tmp_path, mode='wb') as f:
+                await f.write(dump_bytes(all_settings))
+            await asyncio.to_thread(os.replace, tmp_path, self.settings_file)
         except Exception as e:
+            tmp_path.unlink(missing_ok=True)
             raise FileOperationError(f"Failed to save settings file '{self.settings_file}'.") from e
 
     async def get_guild_settings(self, guild_id: int) -> Optional[Dict[str, Any]]:
@@ -74,4 +103,35 @@ class SettingsRepository:
         """
         all_settings = await self._load_all_settings()
         all_settings[str(guild_id)] = settings
-        await self._save_all_settings(all_settings)
+        self._dirty = True
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_after_delay())
+
+    async def _flush_after_delay(self):
+        """
+        Waits for further changes to settle, then writes the settings file.
+        Repeats while changes arrived during the write, since those do not schedule a new task.
+        """
+        while True:
+            await asyncio.sleep(self.flush_delay)
+            try:
+                await self.flush()
+            except FileOperationError:
+                logger.exception(f"Failed to write settings file '{self.settings_file}'.")
+                return
+            if not self._dirty:
+                return
+
+    async def flush(self):
+        """Writes pending settings changes to the JSON file immediately."""
+        async with self._write_lock:
+            if not self._dirty or self._cache is None:
+                return
+            # Clear the flag before writing so changes made during the write are picked up
+            # by the next pass of _flush_after_delay (or the next flush call).
+            self._dirty = False
+            try:
+                await self._save_all_settings(self._cache)
+            except FileOperationError:
+                self._dirty = True
+                raise
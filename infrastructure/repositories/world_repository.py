@@ -1,9 +1,13 @@
+import asyncio
 import json
+import os
+import uuid
 import aiofiles
 from pathlib import Path
 from typing import Dict, Any, Optional
 
 from core.errors import FileOperationError
+from core.json_utils import dump_bytes, loads
 
 class WorldRepository:
     """
@@ -17,13 +21,21 @@ class WorldRepository:
         """
         self.file_path = Path(file_path)
         self.file_path.parent.mkdir(parents=True, exist_ok=True)
+        # 複数ユーザーの保存が重なっても、書き込みと置き換えを1件ずつ行う
+        self._save_lock = asyncio.Lock()
 
     async def save(self, data: Dict[str, Any]):
         """世界の状態データをJSONファイルとして非同期に保存します。"""
+        # 一時ファイルに書き込んでから置き換えることで、書き込み中のクラッシュでファイルが壊れないようにする
+        # 一時ファイル名は保存ごとに一意にし、他の保存処理と同じファイルを共有しないようにする
+        tmp_path = self.file_path.with_name(f"{self.file_path.name}.{uuid.uuid4().hex}.tmp")
         try:
-            async with aiofiles.open(self.file_path, mode='w', encoding='utf-8') as f:
-                await f.write(json.dumps(data, indent=4, ensure_ascii=False))
+            async with self._save_lock:
+                async with aiofiles.open(tmp_path, mode='wb') as f:
+                    await f.write(dump_bytes(data))
+                await asyncio.to_thread(os.replace, tmp_path, self.file_path)
         except Exception as e:
+            tmp_path.unlink(missing_ok=True)
             raise FileOperationError(f"世界の状態ファイル '{self.file_path}' の保存に失敗しました。") from e
 
     async def load(self) -> Dict[str, Any]:
@@ -32,9 +44,9 @@ class WorldRepository:
             return {"npc_states": {}, "graveyard": {}} # ファイルが存在しない場合は空のデータを返す
 
         try:
-            async with aiofiles.open(self.file_path, mode='r', encoding='utf-8') as f:
+            async with aiofiles.open(self.file_path, mode='rb') as f:
                 content = await f.read()
-                data = json.loads(content)
+                data = loads(content)
                 # 過去のデータとの互換性のため、キーが存在しない場合はデフォルト値を設定
                 data.setdefault("npc_states", {})
                 data.setdefault("graveyard", {})
@@ -5,13 +5,16 @@ import asyncio
 from pathlib import Path
 from typing import Dict
 
+import httpx
+from openai import DefaultAsyncHttpxClient
+
 # プロジェクトのルートディレクトリをPythonのパスに追加
 project_root = os.path.dirname(os.path.abspath(__file__))
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
 from bot.client import MyBot
-from config.settings import BOT_TOKEN, CHAR_SHEET_CHANNEL_ID, SCENARIO_LOG_CHANNEL_ID, PLAY_LOG_CHANNEL_ID, LOCAL_AI_BASE_URL, LOCAL_AI_MODEL_NAME
+from config.settings import SETTINGS
 from game.managers.session_manager import SessionManager
 from infrastructure.data_loaders.world_data_loader import WorldDataLoader
 from infrastructure.data_loaders.prompt_loader import PromptLoader
@@ -58,9 +61,9 @@ def build_dependencies() -> MyBot:
 
     # --- Bot Instance ---
     channel_ids: Dict[str, int] = {
-        "CHAR_SHEET_CHANNEL_ID": CHAR_SHEET_CHANNEL_ID,
-        "SCENARIO_LOG_CHANNEL_ID": SCENARIO_LOG_CHANNEL_ID,
-        "PLAY_LOG_CHANNEL_ID": PLAY_LOG_CHANNEL_ID,
+        "CHAR_SHEET_CHANNEL_ID": SETTINGS.char_sheet_channel_id,
+        "SCENARIO_LOG_CHANNEL_ID": SETTINGS.scenario_log_channel_id,
+        "PLAY_LOG_CHANNEL_ID": SETTINGS.play_log_channel_id,
     }
     bot = MyBot(
         world_data_loader=world_data_loader,
@@ -71,11 +74,21 @@ def build_dependencies() -> MyBot:
     # --- Game Layer (Services) ---
     session_manager = SessionManager()
     character_service = CharacterService(character_repository=character_repository)
+    # AIサーバーとの接続はプロセス全体で1つのプールを共有する。
+    # プレイヤーの入力を待つ間も接続が切れないよう keep-alive を長めに取り、一時的な接続エラーは再試行する。
+    ai_http_client = DefaultAsyncHttpxClient(
+        transport=httpx.AsyncHTTPTransport(
+            retries=2,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=60.0),
+        ),
+    )
     ai_service = AIService(
-        base_url=LOCAL_AI_BASE_URL,
-        model_name=LOCAL_AI_MODEL_NAME,
+        base_url=SETTINGS.local_ai_base_url,
+        model_name=SETTINGS.local_ai_model_name,
         world_data_loader=world_data_loader,
-        prompt_loader=prompt_loader
+        prompt_loader=prompt_loader,
+        http_client=ai_http_client,
+        max_concurrency=SETTINGS.ai_max_concurrency,
     )
     game_service = GameService(
         bot=bot,
@@ -99,14 +112,14 @@ async def main():
     """アプリケーションのメインエントリーポイント"""
     setup_logging()
 
-    if not BOT_TOKEN:
+    if not SETTINGS.bot_token:
         logger.critical("BOT_TOKENが設定されていません。.envファイルを確認してください。")
         return
 
     bot = build_dependencies()
 
-    logger.info(f"Botを起動します... (Token: '{BOT_TOKEN[:5]}...')")
-    await bot.start(BOT_TOKEN)
+    logger.info(f"Botを起動します... (Token: '{SETTINGS.bot_token[:5]}...')")
+    await bot.start(SETTINGS.bot_token)
 
 if __name__ == "__main__":
     try: